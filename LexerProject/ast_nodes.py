@@ -0,0 +1,317 @@
+# nós da AST produzidos pelo parser (classes com __slots__)
+"""
+Nós da AST do parser Kotlin.
+
+Cada construção sintática é uma classe com __slots__ (sem __dict__ por
+instância): ocupa menos memória que um dicionário e o acesso aos campos é
+feito por descritores em C. O atributo de classe NODE_TYPE guarda o antigo
+valor da chave "type", e to_dict() reconstrói a forma de dicionário usada na
+saída JSON (mesmas chaves, na mesma ordem).
+"""
+
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Tuple
+
+
+class Node:
+    """
+    Base dos nós da AST.
+    Subclasses definem _FIELDS (na ordem das chaves do dicionário), usado
+    também como __slots__, e, quando o nome de algum atributo difere da chave,
+    _KEYS com as chaves. _FIELDS existe porque classes compiladas pelo mypyc
+    não expõem __slots__ em tempo de execução.
+    """
+    __slots__ = ()
+    _FIELDS: ClassVar[Tuple[str, ...]] = ()
+    NODE_TYPE: ClassVar[Optional[str]] = None
+    _KEYS: ClassVar[Optional[Tuple[str, ...]]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retorna a forma de dicionário do nó (não recursiva)."""
+        d: Dict[str, Any] = {} if self.NODE_TYPE is None else {"type": self.NODE_TYPE}
+        campos = self._FIELDS
+        for campo, chave in zip(campos, self._KEYS or campos):
+            d[chave] = getattr(self, campo)
+        return d
+
+    def __repr__(self) -> str:
+        campos = ", ".join(f"{c}={getattr(self, c)!r}" for c in self._FIELDS)
+        return f"{type(self).__name__}({campos})"
+
+
+# -------------------------
+# arquivo / declarações
+# -------------------------
+class KotlinFile(Node):
+    _FIELDS = ("package", "imports", "declarations")
+    __slots__ = _FIELDS
+    NODE_TYPE = "kotlinFile"
+
+    def __init__(self, package: "Optional[PackageDecl]", imports: "List[ImportDecl]", declarations: "List[Node]") -> None:
+        self.package = package
+        self.imports = imports
+        self.declarations = declarations
+
+
+class PackageDecl(Node):
+    _FIELDS = ("name",)
+    __slots__ = _FIELDS
+    NODE_TYPE = "package"
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class ImportDecl(Node):
+    _FIELDS = ("path",)
+    __slots__ = _FIELDS
+    NODE_TYPE = "import"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+
+class ClassDecl(Node):
+    _FIELDS = ("name", "modifiers", "body")
+    __slots__ = _FIELDS
+    NODE_TYPE = "class"
+
+    def __init__(self, name: str, modifiers: Sequence[str], body: "Optional[Sequence[Node]]") -> None:
+        self.name = name
+        self.modifiers = modifiers
+        self.body = body
+
+
+class ObjectDecl(Node):
+    _FIELDS = ("name", "modifiers", "members")
+    __slots__ = _FIELDS
+    NODE_TYPE = "object"
+
+    def __init__(self, name: Optional[str], modifiers: Sequence[str], members: "Sequence[Node]") -> None:
+        self.name = name
+        self.modifiers = modifiers
+        self.members = members
+
+
+class FunctionDecl(Node):
+    _FIELDS = ("name", "modifiers", "params", "return_type", "body")
+    __slots__ = _FIELDS
+    NODE_TYPE = "function"
+    _KEYS = ("name", "modifiers", "params", "return", "body")
+
+    def __init__(self, name: str, modifiers: Sequence[str], params: "Sequence[Param]", return_type: Optional[str], body: "Optional[Block]") -> None:
+        self.name = name
+        self.modifiers = modifiers
+        self.params = params
+        self.return_type = return_type
+        self.body = body
+
+
+class Param(Node):
+    """Parâmetro de função; na forma de dicionário não tem chave "type" de nó."""
+    _FIELDS = ("name", "var_type")
+    __slots__ = _FIELDS
+    _KEYS = ("name", "type")
+
+    def __init__(self, name: str, var_type: Optional[str]) -> None:
+        self.name = name
+        self.var_type = var_type
+
+
+class PropertyDecl(Node):
+    _FIELDS = ("kind", "name", "var_type", "value", "modifiers")
+    __slots__ = _FIELDS
+    NODE_TYPE = "property"
+
+    def __init__(self, kind: str, name: str, var_type: Optional[str], value: "Optional[Node]", modifiers: Sequence[str]) -> None:
+        self.kind = kind
+        self.name = name
+        self.var_type = var_type
+        self.value = value
+        self.modifiers = modifiers
+
+
+class Destructuring(Node):
+    _FIELDS = ("kind", "parts", "value", "modifiers")
+    __slots__ = _FIELDS
+    NODE_TYPE = "destructuring"
+
+    def __init__(self, kind: str, parts: Sequence[str], value: "Optional[Node]", modifiers: Sequence[str]) -> None:
+        self.kind = kind
+        self.parts = parts
+        self.value = value
+        self.modifiers = modifiers
+
+
+# -------------------------
+# statements
+# -------------------------
+class Block(Node):
+    _FIELDS = ("statements",)
+    __slots__ = _FIELDS
+    NODE_TYPE = "block"
+
+    def __init__(self, statements: "List[Node]") -> None:
+        self.statements = statements
+
+
+class ExprStmt(Node):
+    _FIELDS = ("expr",)
+    __slots__ = _FIELDS
+    NODE_TYPE = "expr_stmt"
+
+    def __init__(self, expr: "Node") -> None:
+        self.expr = expr
+
+
+class IfStmt(Node):
+    _FIELDS = ("cond", "then", "else_")
+    __slots__ = _FIELDS
+    NODE_TYPE = "if"
+    _KEYS = ("cond", "then", "else")
+
+    def __init__(self, cond: "Node", then: "Optional[Node]", else_: "Optional[Node]") -> None:
+        self.cond = cond
+        self.then = then
+        self.else_ = else_
+
+
+class ForStmt(Node):
+    _FIELDS = ("var", "range", "body")
+    __slots__ = _FIELDS
+    NODE_TYPE = "for"
+
+    def __init__(self, var: Optional[str], range: "Optional[Node]", body: "Optional[Node]") -> None:
+        self.var = var
+        self.range = range
+        self.body = body
+
+
+# -------------------------
+# expressões
+# -------------------------
+class BinOp(Node):
+    _FIELDS = ("op", "left", "right")
+    __slots__ = _FIELDS
+    NODE_TYPE = "binary"
+
+    def __init__(self, op: str, left: "Node", right: "Node") -> None:
+        self.op = op
+        self.left = left
+        self.right = right
+
+
+class Unary(Node):
+    _FIELDS = ("op", "operand")
+    __slots__ = _FIELDS
+    NODE_TYPE = "unary"
+
+    def __init__(self, op: str, operand: "Node") -> None:
+        self.op = op
+        self.operand = operand
+
+
+class Postfix(Node):
+    _FIELDS = ("op", "operand")
+    __slots__ = _FIELDS
+    NODE_TYPE = "postfix"
+
+    def __init__(self, op: str, operand: "Node") -> None:
+        self.op = op
+        self.operand = operand
+
+
+class Literal(Node):
+    _FIELDS = ("kind", "value")
+    __slots__ = _FIELDS
+    NODE_TYPE = "literal"
+
+    def __init__(self, kind: str, value: Any) -> None:
+        self.kind = kind
+        self.value = value
+
+
+class Identifier(Node):
+    _FIELDS = ("name",)
+    __slots__ = _FIELDS
+    NODE_TYPE = "identifier"
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class Call(Node):
+    _FIELDS = ("callee", "args")
+    __slots__ = _FIELDS
+    NODE_TYPE = "call"
+
+    def __init__(self, callee: "Node", args: "List[Node]") -> None:
+        self.callee = callee
+        self.args = args
+
+
+class Member(Node):
+    _FIELDS = ("target", "op", "member")
+    __slots__ = _FIELDS
+    NODE_TYPE = "member"
+
+    def __init__(self, target: "Node", op: str, member: str) -> None:
+        self.target = target
+        self.op = op
+        self.member = member
+
+
+class ErrorNode(Node):
+    _FIELDS = ("token",)
+    __slots__ = _FIELDS
+    NODE_TYPE = "error"
+
+    def __init__(self, token: Optional[str]) -> None:
+        self.token = token
+
+
+# -------------------------
+# strings
+# -------------------------
+class StringLit(Node):
+    _FIELDS = ("parts",)
+    __slots__ = _FIELDS
+    NODE_TYPE = "string"
+
+    def __init__(self, parts: "List[Node]") -> None:
+        self.parts = parts
+
+
+class TextPart(Node):
+    _FIELDS = ("value",)
+    __slots__ = _FIELDS
+    NODE_TYPE = "text"
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+class InterpId(Node):
+    _FIELDS = ("name",)
+    __slots__ = _FIELDS
+    NODE_TYPE = "interp_id"
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class InterpExpr(Node):
+    _FIELDS = ("expr_text",)
+    __slots__ = _FIELDS
+    NODE_TYPE = "interp_expr"
+
+    def __init__(self, expr_text: str) -> None:
+        self.expr_text = expr_text
+
+
+class UnknownPart(Node):
+    _FIELDS = ("token",)
+    __slots__ = _FIELDS
+    NODE_TYPE = "unknown"
+
+    def __init__(self, token: Optional[str]) -> None:
+        self.token = token
@@ -1,4 +1,6 @@
  # OPERADORES, SIMBOLOS, KEYWORDS
+import sys
+
 # mapeamento lexema -> token-type
 OPERADORES = {
     # atribuição
@@ -87,20 +89,29 @@ HARD_KEYWORDS = {
 }
 
 # cria um mapa lexema -> token_type (strings)
+# os nomes gerados por concatenação são internados (sys.intern) para que as
+# comparações do parser com os literais "KW_..." caiam no atalho de identidade
 KEYWORDS = {}
 
 # hard keywords: prefix KW_
 for kw in HARD_KEYWORDS:
     # normaliza lexema para nome de token: transforma chars problemáticos
     token_name = "KW_" + kw.upper().replace('?', '_Q').replace('!', 'NOT_').replace('-', '_').replace('.', '_').replace('<', '_LT_').replace('>', '_GT_')
-    KEYWORDS[kw] = token_name
+    KEYWORDS[kw] = sys.intern(token_name)
 
 # soft keywords: prefix SK_
 for kw in SOFT_KEYWORDS:
     token_name = "SK_" + kw.upper().replace('?', '_Q').replace('!', 'NOT_').replace('-', '_')
-    KEYWORDS[kw] = token_name
+    KEYWORDS[kw] = sys.intern(token_name)
 
 # modifier keywords: prefix MOD_
 for kw in MODIFIER_KEYWORDS:
     token_name = "MOD_" + kw.upper().replace('-', '_')
-    KEYWORDS[kw] = token_name
\ No newline at end of file
+    KEYWORDS[kw] = sys.intern(token_name)
+
+# conjunto dos token-types de modificadores (MOD_*), para checagens por hash
+MODIFIER_TOKEN_TYPES = frozenset(KEYWORDS[kw] for kw in MODIFIER_KEYWORDS)
+
+# faixa de tamanhos das keywords: lexemas fora dela nem consultam KEYWORDS
+KW_MIN_LEN = min(len(kw) for kw in KEYWORDS)
+KW_MAX_LEN = max(len(kw) for kw in KEYWORDS)
\ No newline at end of file
@@ -1,7 +1,86 @@
+import re
+import string
+import sys
+
 from .tokens import Token
-from .constantes import OPERADORES, SIMBOLOS, KEYWORDS
+from .constantes import OPERADORES, SIMBOLOS, KEYWORDS, KW_MIN_LEN, KW_MAX_LEN
 from .utils import eh_hex, eh_bin, eh_sufixo_inteiro, eh_sufixo_float, eh_separador
 
+# regex pré-compiladas: percorrem trechos inteiros em C (uma chamada por trecho)
+_RE_RESTO_LINHA = re.compile(r'[^\n\x00]*')
+# \w equivale a isalnum() ou '_' (mesmo critério do laço original de identificadores)
+_RE_PALAVRA = re.compile(r'\w+')
+# texto comum de string: para em aspas, '$', escape, quebra de linha (simples) ou '\0'
+_RE_TEXTO_STRING = re.compile(r'[^"\\$\n\x00]*')
+_RE_TEXTO_STRING_TRIPLA = re.compile(r'[^"$\x00]*')
+_RE_EXPR_INTERP = re.compile(r'[^}\x00]*')
+_RE_MARCA_BLOCO = re.compile(r'/\*|\*/|\x00')
+_RE_ATE_CRASE = re.compile(r'[^`\x00]*')
+_RE_DIGITOS = re.compile(r'[\d_]*')
+_RE_DIGITOS_HEX = re.compile(r'[\dA-Fa-f_]*')
+_RE_DIGITOS_BIN = re.compile(r'[01_]*')
+def _regex_prefixos(palavras):
+    # alternação fatorada por prefixo comum (árvore de decisão por caractere):
+    # ex.: '=', '==', '===' viram =(?:=(?:=)?)?. Os quantificadores gulosos
+    # tentam o ramo mais longo primeiro, então o casamento é maximal munch.
+    trie = {}
+    for palavra in palavras:
+        no = trie
+        for c in palavra:
+            no = no.setdefault(c, {})
+        no[''] = {}
+
+    def gera(no):
+        ramos = [re.escape(c) + gera(filho) for c, filho in sorted(no.items()) if c]
+        if not ramos:
+            return ''
+        if '' in no:
+            return '(?:%s)?' % '|'.join(ramos)
+        return ramos[0] if len(ramos) == 1 else '(?:%s)' % '|'.join(ramos)
+
+    return gera(trie)
+
+
+# regex mestre de proximo_token: espaços e comentários de linha seguidos e,
+# depois deles, o início de comentário de bloco ou um token simples
+# (identificador ASCII, operador por árvore de prefixos, símbolo).
+# Números, strings, chars, letras Unicode e erros seguem pelo despacho.
+_RE_TOKEN = re.compile(
+    r'(?:[ \t\r\n]+|//[^\n\x00]*)*'
+    r'(?:(?P<BLOCO>/\*)|(?P<ID>[A-Za-z_]\w*)|(?P<OP>%s)|(?P<SIM>%s))?' % (
+        _regex_prefixos(OPERADORES),
+        '|'.join(re.escape(simbolo) for simbolo in SIMBOLOS),
+    )
+)
+
+# valor semântico das keywords literais (as demais, inclusive null, ficam None)
+_VALOR_KEYWORD = {"KW_TRUE": True, "KW_FALSE": False}
+# lexema -> (tipo, lexema canônico, valor): tokens de keyword reusam a string
+# chave de KEYWORDS (compartilhada e internada) em vez da fatia recém-criada
+_KEYWORD_INFO = {kw: (tipo, sys.intern(kw), _VALOR_KEYWORD.get(tipo)) for kw, tipo in KEYWORDS.items()}
+
+
+def _varrer(src, pos, regex, continua):
+    # avança com a regex e completa com o predicado original nos casos que a
+    # classe da regex não cobre (ex.: '²'.isdigit() é True, mas '²' não casa com \d)
+    n = len(src)
+    while True:
+        pos = regex.match(src, pos).end()
+        if pos < n and continua(src[pos]):
+            pos += 1
+        else:
+            return pos
+
+
+def _token_palavra(lexema, linha, coluna):
+    # uma única consulta classifica o lexema; identificador comum sai direto
+    # (pelo tamanho, a maioria nem chega a ser procurada em KEYWORDS)
+    info = _KEYWORD_INFO.get(lexema) if KW_MIN_LEN <= len(lexema) <= KW_MAX_LEN else None
+    if info is None:
+        return Token("IDENTIFIER", lexema, None, linha, coluna)
+    tipo, lexema, valor = info
+    return Token(tipo, lexema, valor, linha, coluna)
+
 class Lexer:
     def __init__(self, source):
         self.source = source
@@ -10,6 +89,15 @@ class Lexer:
         self.coluna = 1
         self.erros = [] 
 
+        # despacho pelo primeiro caractere dos tokens que _RE_TOKEN não casa
+        # (letras e dígitos Unicode seguem pelos testes isalpha/isdigit em
+        # proximo_token; o resto é erro léxico)
+        despacho = dict.fromkeys(string.digits, self.reconhece_literais_numericos)
+        despacho['"'] = self.reconhece_string
+        despacho["'"] = self.reconhece_char_literal
+        despacho['`'] = self.reconhece_identificador_crase
+        self._despacho = despacho
+
     # ==================================================
     # AUXILIARES BÁSICOS
     # ==================================================
@@ -38,6 +126,18 @@ class Lexer:
             self.coluna += 1
         return ch
 
+    def avancar_ate(self, fim):
+        # avança direto até a posição fim, corrigindo linha/coluna de uma vez
+        src = self.source
+        inicio = self.pos
+        quebras = src.count('\n', inicio, fim)
+        if quebras:
+            self.linha += quebras
+            self.coluna = fim - src.rfind('\n', inicio, fim)
+        else:
+            self.coluna += fim - inicio
+        self.pos = fim
+
     # ==================================================
     # MODO PÂNICO
     # ==================================================
@@ -51,78 +151,75 @@ class Lexer:
     # ==================================================
     # IGNORAR ESPAÇOS E COMENTÁRIOS
     # ==================================================
-    def pular_espaco(self):
-        while self.ch_atual() in [' ', '\t', '\r', '\n']:
-            self.avancar()
-
     def pular_comentario_linha(self):
-        while self.ch_atual() != '\n' and self.ch_atual() != '\0':
-            self.avancar()
+        # consome até '\n' ou '\0' (exclusive); o trecho não tem quebras de linha
+        fim = _RE_RESTO_LINHA.match(self.source, self.pos).end()
+        self.coluna += fim - self.pos
+        self.pos = fim
 
     def pular_comentario_blocos(self):
+        # salta direto de marca em marca ('/*', '*/' ou '\0'); a busca pela
+        # marca mais à esquerda, com '/*' antes de '*/', equivale ao laço por
+        # caractere, e linha/coluna são corrigidas uma vez no fim
+        src = self.source
         profundidade = 1
-        self.avancar(); self.avancar() # /*
+        pos = self.pos + 2 # /*
         while profundidade > 0:
-            if self.ch_atual() == '\0':
+            m = _RE_MARCA_BLOCO.search(src, pos)
+            if m is None or m.group() == '\0':
+                self.avancar_ate(m.start() if m else len(src))
                 return self.erro_lexico("Comentário de bloco não fechado")
-            
-            if self.ch_atual() == '/' and self.ch_proximo() == '*':
-                profundidade += 1
-                self.avancar(); self.avancar()
-            elif self.ch_atual() == '*' and self.ch_proximo() == '/':
-                profundidade -= 1
-                self.avancar(); self.avancar()
-            else:
-                self.avancar()
+            profundidade += 1 if m.group() == '/*' else -1
+            pos = m.end()
+        self.avancar_ate(pos)
 
     # ==================================================
     # LITERAIS NUMÉRICOS
     # ==================================================
     def reconhece_literais_numericos(self):
-        inicio = self.pos
+        src = self.source
+        n = len(src)
+        inicio = pos = self.pos
         linha, coluna = self.linha, self.coluna
         tipo = "INT_LITERAL"
         base = 10 
         
+        # Literais numéricos não têm quebra de linha: a varredura usa só o
+        # índice local pos, e self.pos/self.coluna são acertados uma vez no fim.
+
         # Hexadecimal (0x) ou Binário (0b)
-        if self.ch_atual() == '0':
-            if self.ch_proximo().lower() == 'x':
-                base = 16
-                self.avancar(); self.avancar()
-                while self.eh_hex(self.ch_atual()) or self.eh_separador(self.ch_atual()):
-                    self.avancar()
-            elif self.ch_proximo().lower() == 'b':
-                base = 2
-                self.avancar(); self.avancar()
-                while self.eh_bin(self.ch_atual()) or self.eh_separador(self.ch_atual()):
-                    self.avancar()
+        prox = src[pos + 1] if pos + 1 < n else '\0'
+        if src[pos] == '0' and prox in 'xX':
+            base = 16
+            pos = _varrer(src, pos + 2, _RE_DIGITOS_HEX, eh_hex)
+        elif src[pos] == '0' and prox in 'bB':
+            base = 2
+            pos = _RE_DIGITOS_BIN.match(src, pos + 2).end()
 
         # Decimal ou Float
         if base == 10:
-            while self.ch_atual().isdigit() or self.eh_separador(self.ch_atual()):
-                self.avancar()
+            pos = _varrer(src, pos, _RE_DIGITOS, str.isdigit)
             
-            if self.ch_atual() == '.' and self.ch_proximo() != '.': 
+            if src.startswith('.', pos) and not src.startswith('..', pos): 
                 tipo = "FLOAT_LITERAL"
-                self.avancar()
-                while self.ch_atual().isdigit() or self.eh_separador(self.ch_atual()):
-                    self.avancar()
+                pos = _varrer(src, pos + 1, _RE_DIGITOS, str.isdigit)
             
-            if self.ch_atual().lower() == 'e':
+            if pos < n and src[pos] in 'eE':
                 tipo = "FLOAT_LITERAL"
-                self.avancar()
-                if self.ch_atual() in ['+', '-']: 
-                    self.avancar()
-                while self.ch_atual().isdigit() or self.eh_separador(self.ch_atual()):
-                    self.avancar()
+                pos += 1
+                if pos < n and src[pos] in '+-': 
+                    pos += 1
+                pos = _varrer(src, pos, _RE_DIGITOS, str.isdigit)
 
         # Consome sufixos (L, u, f) do código fonte
-        while self.ch_atual().lower() in ['u', 'l', 'f']:
-            if self.ch_atual().lower() == 'f':
+        while pos < n and src[pos] in 'uUlLfF':
+            if src[pos] in 'fF':
                 tipo = "FLOAT_LITERAL"
-            self.avancar()
+            pos += 1
 
-        lexema = self.source[inicio:self.pos]
+        self.coluna += pos - inicio
+        self.pos = pos
+        lexema = src[inicio:pos]
         
         # --- CÁLCULO DO VALOR ---
         valor_limpo = lexema.replace('_', '').lower()
@@ -159,26 +256,17 @@ class Lexer:
     def reconhece_identificadores(self):
         inicio = self.pos
         linha, coluna = self.linha, self.coluna
-        while self.ch_atual().isalnum() or self.ch_atual() == '_':  
-            self.avancar()
-        lexema = self.source[inicio:self.pos]
-        
-        tipo = KEYWORDS.get(lexema)
-        valor = None
-        if tipo == "KW_TRUE": valor = True
-        elif tipo == "KW_FALSE": valor = False
-        elif tipo == "KW_NULL": valor = None
-        
-        if tipo is not None:
-            return Token(tipo, lexema, valor, linha, coluna)
-        return Token("IDENTIFIER", lexema, None, linha, coluna)
+        # o primeiro caractere já é letra ou '_', então \w+ casa ao menos ele
+        fim = _RE_PALAVRA.match(self.source, inicio).end()
+        self.coluna += fim - inicio
+        self.pos = fim
+        return _token_palavra(self.source[inicio:fim], linha, coluna)
 
     def reconhece_identificador_crase(self):
         linha, coluna = self.linha, self.coluna
         self.avancar()
         inicio = self.pos
-        while self.ch_atual() != '`' and self.ch_atual() != '\0':
-            self.avancar()
+        self.avancar_ate(_RE_ATE_CRASE.match(self.source, inicio).end())
         
         if self.ch_atual() != '`':
             return self.erro_lexico("Identificador com crase não fechado")
@@ -233,19 +321,25 @@ class Lexer:
 
     def reconhece_string(self):
         linha, coluna = self.linha, self.coluna
-        is_triple = False
-        
-        if self.ch_atual() == '"' and self.ch_proximo() == '"' and self.ch_proximo_n(2) == '"':
-            is_triple = True
-            self.avancar(); self.avancar(); self.avancar()
-        else:
-            self.avancar()
+        is_triple = self.source.startswith('"""', self.pos)
+        # aspas de abertura: sem quebra de linha, avança pos/coluna direto
+        abertura = 3 if is_triple else 1
+        self.pos += abertura
+        self.coluna += abertura
 
         tokens = []
         tokens.append(Token("STRING_START", '"""' if is_triple else '"', None, linha, coluna))
 
-        buffer = ""
+        # o texto é acumulado como trechos fatiados de self.source (mais os
+        # escapes já processados) e só vira string no join, ao emitir STRING_TEXT
+        src = self.source
+        re_texto = _RE_TEXTO_STRING_TRIPLA if is_triple else _RE_TEXTO_STRING
+        partes = []
         while True:
+            fim = re_texto.match(src, self.pos).end()
+            if fim > self.pos:
+                partes.append(src[self.pos:fim])
+                self.avancar_ate(fim)
             ch = self.ch_atual()
             
             if ch == '\0':
@@ -253,13 +347,17 @@ class Lexer:
 
             if is_triple:
                 if ch == '"' and self.ch_proximo() == '"' and self.ch_proximo_n(2) == '"':
-                    if buffer: tokens.append(Token("STRING_TEXT", buffer, buffer, linha, coluna))
+                    if partes:
+                        texto = ''.join(partes)
+                        tokens.append(Token("STRING_TEXT", texto, texto, linha, coluna))
                     tokens.append(Token("STRING_END", '"""', None, self.linha, self.coluna))
                     self.avancar(); self.avancar(); self.avancar()
                     break
             else:
                 if ch == '"':
-                    if buffer: tokens.append(Token("STRING_TEXT", buffer, buffer, linha, coluna))
+                    if partes:
+                        texto = ''.join(partes)
+                        tokens.append(Token("STRING_TEXT", texto, texto, linha, coluna))
                     tokens.append(Token("STRING_END", '"', None, self.linha, self.coluna))
                     self.avancar()
                     break
@@ -267,93 +365,98 @@ class Lexer:
                      return self.erro_lexico("Quebra de linha em string simples")
 
             if ch == '$':
-                if buffer:
-                    tokens.append(Token("STRING_TEXT", buffer, buffer, linha, coluna))
-                    buffer = ""
+                if partes:
+                    texto = ''.join(partes)
+                    tokens.append(Token("STRING_TEXT", texto, texto, linha, coluna))
+                    partes = []
                 
                 self.avancar()
                 if self.ch_atual() == '{':
                     tokens.append(Token("STRING_INTERP_START", "${", None, self.linha, self.coluna))
                     self.avancar()
-                    expr_str = ""
-                    while self.ch_atual() != '}' and self.ch_atual() != '\0':
-                         expr_str += self.avancar()
+                    fim = _RE_EXPR_INTERP.match(src, self.pos).end()
+                    expr_str = src[self.pos:fim]
+                    self.avancar_ate(fim)
                     tokens.append(Token("STRING_INTERP_EXPR", expr_str, None, self.linha, self.coluna))
                     tokens.append(Token("STRING_INTERP_END", "}", None, self.linha, self.coluna))
                     self.avancar()
                 else:
                     inicio_id = self.pos
-                    while self.ch_atual().isalnum() or self.ch_atual() == '_':
-                        self.avancar()
-                    nome_id = self.source[inicio_id:self.pos]
+                    m = _RE_PALAVRA.match(src, inicio_id)
+                    if m:
+                        self.coluna += m.end() - inicio_id
+                        self.pos = m.end()
+                    nome_id = src[inicio_id:self.pos]
                     tokens.append(Token("STRING_INTERP_ID", nome_id, None, self.linha, self.coluna))
                 continue
 
             if ch == '\\' and not is_triple:
-                buffer += self.processar_escape()
+                partes.append(self.processar_escape())
             else:
-                buffer += ch
+                # só aspas soltas dentro de string tripla chegam aqui
+                partes.append(ch)
                 self.avancar()
         
         return tokens
 
-    # ==================================================
-    # OPERADORES
-    # ==================================================
-    def reconhece_operadores(self):
-        linha, coluna = self.linha, self.coluna
-        for tamanho in (3, 2, 1):
-            if self.pos + tamanho <= len(self.source):
-                lexema = self.source[self.pos : self.pos + tamanho]
-                if lexema in OPERADORES:
-                    for _ in range(tamanho): self.avancar()
-                    return Token(OPERADORES[lexema], lexema, None, linha, coluna)
-        return None
-
     # ==================================================
     # LOOP PRINCIPAL
     # ==================================================
     def proximo_token(self):
-        if self.pos == 0 and self.ch_atual() == '#' and self.ch_proximo() == '!':
-            self.pular_linha()
-            return self.proximo_token()
-        
-        self.pular_espaco()
+        # ch_atual/ch_proximo inlinados: leitura direta de src com o mesmo
+        # '\0' além do fim
+        src = self.source
+        n = len(src)
 
-        if self.ch_atual() == '\0':
+        # shebang (#!...) na primeira linha é pulado como comentário de linha
+        if self.pos == 0 and src.startswith('#!'):
+            self.pular_comentario_linha()
+        
+        # espaços, comentários e o token simples seguinte saem de uma única
+        # chamada da regex mestre; comentários de bloco (aninháveis) são
+        # pulados à parte e o laço continua depois deles (sem recursão)
+        while True:
+            m = _RE_TOKEN.match(src, self.pos)
+            grupo = m.lastgroup
+            if grupo is None:
+                # (após erro no fim da entrada pos pode passar de len(src),
+                # e a regex devolve fim = len(src): não se volta atrás)
+                if m.end() > self.pos:
+                    self.avancar_ate(m.end())
+                break
+            inicio = m.start(grupo)
+            if inicio != self.pos:
+                self.avancar_ate(inicio)
+            if grupo == 'BLOCO':
+                self.pular_comentario_blocos()
+                continue
+            # tokens simples não contêm quebra de linha
+            lexema = m.group(grupo)
+            linha, coluna = self.linha, self.coluna
+            self.pos = m.end()
+            self.coluna = coluna + len(lexema)
+            if grupo == 'ID':
+                return _token_palavra(lexema, linha, coluna)
+            if grupo == 'OP':
+                return Token(OPERADORES[lexema], lexema, None, linha, coluna)
+            return Token(SIMBOLOS[lexema], lexema, None, linha, coluna)
+
+        ch = src[self.pos] if self.pos < n else '\0'
+        if ch == '\0':
             return Token("EOF", "", None, self.linha, self.coluna)
 
-        if self.ch_atual() == '/' and self.ch_proximo() == '/':
-            self.pular_comentario_linha()
-            return self.proximo_token()
-        if self.ch_atual() == '/' and self.ch_proximo() == '*':
-            erro = self.pular_comentario_blocos()
-            if erro: return None 
-            return self.proximo_token()
+        tratador = self._despacho.get(ch)
+        if tratador is not None:
+            return tratador()
 
-        if self.ch_atual().isalpha() or self.ch_atual() == '_':
+        # fora do ASCII: letras e dígitos Unicode
+        if ch.isalpha():
             return self.reconhece_identificadores()
         
-        if self.ch_atual().isdigit():
+        if ch.isdigit():
             return self.reconhece_literais_numericos()
         
-        if self.ch_atual() == '"':
-            return self.reconhece_string()
-
-        if self.ch_atual() == "'":
-            return self.reconhece_char_literal()
-        
-        if self.ch_atual() == '`':
-            return self.reconhece_identificador_crase()
-
-        token_op = self.reconhece_operadores()
-        if token_op: return token_op
-        
-        if self.ch_atual() in SIMBOLOS:
-            ch = self.avancar()
-            return Token(SIMBOLOS[ch], ch, None, self.linha, self.coluna - 1)
-        
-        return self.erro_lexico(f"Caractere inesperado '{self.ch_atual()}'")
+        return self.erro_lexico(f"Caractere inesperado '{ch}'")
 
     def tokenize(self):
         tokens = []
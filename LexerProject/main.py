@@ -30,11 +30,12 @@ def analisar_codigo(nome_arquivo, source_text):
     print("AST (sumário):")
     # imprimir de forma resumida (evita dumps gigantes)
     import json
-    print(json.dumps(ast, indent=2, ensure_ascii=False))
+    # os nós da AST são objetos com __slots__; to_dict() dá a forma serializável
+    print(json.dumps(ast, indent=2, ensure_ascii=False, default=lambda no: no.to_dict()))
     if parser.errors:
         print(f"{'-'*60}")
         print("Erros sintáticos encontrados:")
-        for e in parser.errors:
+        for e in parser.format_errors():
             print(e)
     else:
         print(f"{'-'*60}")
@@ -3,10 +3,10 @@
 Parser LL(1) por descida recursiva (custo-benefício) para um subconjunto essencial da sintaxe Kotlin.
 
 Principais responsabilidades:
-- Consumir tokens fornecidos pelo TokenStream do lexer (via TokenStreamWrapper).
+- Consumir tokens fornecidos pelo TokenStream do lexer (lidos de uma vez para uma lista).
 - Reconstruir estruturas sintáticas essenciais (package, import, class, object,
   function, property, blocos, if, for, expressões com precedência).
-- Construir uma AST em dicionários Python.
+- Construir uma AST com os nós de ast_nodes (classes com __slots__).
 - Registrar e recuperar de erros sintáticos com estratégia de pânico (sync tokens).
 
 Observação: o parser foi projetado para uso acadêmico e não implementa toda a
@@ -14,57 +14,123 @@ complexidade da gramática Kotlin real. É tolerante em alguns erros comuns (ex.
 por literal) para reduzir erros em cascata.
 """
 
-from typing import List
+import sys
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from .ast_nodes import (
+    Node, KotlinFile, PackageDecl, ImportDecl, ClassDecl, ObjectDecl, FunctionDecl, Param,
+    PropertyDecl, Destructuring, Block, ExprStmt, IfStmt, ForStmt, BinOp, Unary,
+    Postfix, Literal, Identifier, Call, Member, ErrorNode, StringLit, TextPart,
+    InterpId, InterpExpr, UnknownPart,
+)
+from .constantes import MODIFIER_TOKEN_TYPES
+from .tokens import Token
+
+# lexemas guardados na AST (nomes, tipos, modificadores) são internados:
+# identificadores repetidos passam a compartilhar um único objeto str
+_intern = sys.intern
+
+# Conjuntos de tipos de token usados em checagens "in" frequentes: frozensets
+# montados uma vez no carregamento do módulo (busca por hash, sem varrer tuplas).
+_BLOCK_END: FrozenSet[str] = frozenset({"RBRACE", "EOF"})
+# tokens de sincronização do modo pânico
+_PANIC_SYNC: FrozenSet[str] = frozenset({"SEMICOLON", "RBRACE", "EOF"})
+_STRING_END: FrozenSet[str] = frozenset({"STRING_END", "EOF"})
+_MODIFIER_TOKENS: FrozenSet[str] = MODIFIER_TOKEN_TYPES
+_IMPORT_KEYWORDS: FrozenSet[str] = frozenset({"SK_IMPORT", "IMPORT"})
+_PAREN_END: FrozenSet[str] = frozenset({"RPAREN", "EOF"})
+# nomes: identificador comum ou entre crases
+_NAME_TOKENS: FrozenSet[str] = frozenset({"IDENTIFIER", "Quoted_identifier"})
+# acesso a membro: '.', '?.' e '!!'
+_MEMBER_OPS: FrozenSet[str] = frozenset({"DOT", "OP_SAFE_CALL", "OP_NOT_NULL"})
+_PREFIX_OPS: FrozenSet[str] = frozenset({"OP_NOT", "OP_MINUS"})
+_POSTFIX_OPS: FrozenSet[str] = frozenset({"OP_INC", "OP_DEC"})
+# palavras que formam '!in' / '!is' quando precedidas de '!'
+_NEGATABLE_KEYWORDS: FrozenSet[str] = frozenset({"KW_IN", "KW_IS"})
+# tokens que podem iniciar uma expressão (recuperação tolerante em propriedades)
+_EXPR_STARTERS: FrozenSet[str] = frozenset({"INT_LITERAL", "FLOAT_LITERAL", "STRING_START", "CHAR_LITERAL", "IDENTIFIER", "LPAREN"})
+
+# Níveis de precedência dos operadores binários, do que liga mais fraco (elvis
+# '?:') ao que liga mais forte (multiplicativos). Todos são associativos à
+# esquerda. É a única fonte da tabela: _BINOP_PREC é derivado daqui na carga
+# do módulo (nível i -> precedência i+1).
+_LEVELS: List[Tuple[str, ...]] = [
+    ("OP_ELVIS",),
+    ("OP_OR",),
+    ("OP_AND",),
+    # igualdade
+    ("OP_EQ", "OP_NEQ", "OP_EQ_STRICT", "OP_NEQ_STRICT"),
+    # relacionais (in, is, as, comparação e ranges); '!in'/'!is' e 'as?'
+    # são tratados como casos especiais em parse_binary
+    ("KW_IN", "KW_IS", "KW_AS",
+     "OP_GE", "OP_LE", "OP_GT", "OP_LT", "OP_RANGE", "OP_RANGE_UNTIL"),
+    # aditivos (nota: += e -= tratados como binários aqui)
+    ("OP_PLUS", "OP_MINUS", "OP_PLUS_ASSIGN", "OP_MINUS_ASSIGN"),
+    # multiplicativos
+    ("OP_MUL", "OP_DIV", "OP_MOD"),
+]
+_BINOP_PREC: Dict[str, int] = {
+    tipo: nivel + 1 for nivel, tipos in enumerate(_LEVELS) for tipo in tipos
+}
+_REL_PREC: int = _BINOP_PREC["KW_IN"]
+
+# sentinela compartilhada para listas vazias da AST (modifiers, params, corpos):
+# evita alocar uma lista nova por nó; a AST é tratada como somente leitura
+_EMPTY: Tuple[()] = ()
+
+# assinatura dos métodos de declaração chamados pelas tabelas de despacho
+_DeclFn = Callable[[Sequence[str]], Node]
+
+# profundidade máxima de aninhamento (expressões + instruções) aceita pelo
+# parser; além dela é registrado "Aninhamento excessivo". O contador é
+# explícito porque os builds compilados (mypyc/Cython) recursam na pilha C e
+# estourariam a pilha (SIGSEGV) antes de qualquer RecursionError do Python
+_MAX_NESTING: int = 1000
+
+# frames Python por nível de aninhamento no pior caso: uma cadeia com todos os
+# níveis de precedência antes de um '(' (a ?: a || a && ... * (...)) empilha
+# parse_expression, len(_LEVELS) + 1 chamadas de parse_binary (o operando
+# direito do último nível ainda passa por uma), parse_unary, parse_primary e
+# _parse_parenthesized
+_FRAMES_PER_LEVEL: int = len(_LEVELS) + 5
+# limite de recursão usado durante parse() no Python puro, derivado do pior
+# caso acima com folga para os frames da pilha de chamada e das declarações;
+# o padrão do CPython (1000) cobriria menos de cem níveis dessa cadeia
+_RECURSION_LIMIT: int = _MAX_NESTING * _FRAMES_PER_LEVEL + 3000
+
+# quantidade de tokens pedidos ao token stream por chamada de next_batch
+_BATCH_SIZE: int = 256
+
+# erro sintático registrado: (linha, coluna, mensagem, lexema do token)
+_ErrorInfo = Tuple[int, int, str, str]
+
+
+# formato da mensagem de erro: aplicado com % direto sobre a tupla registrada
+_ERROR_FMT: str = "Erro sintático na linha %s, coluna %s: %s (token='%s')"
+
+
+def _format_error(erro: _ErrorInfo) -> str:
+    """Monta o texto de um erro sintático registrado por _error_at_token."""
+    return _ERROR_FMT % erro
+
 
 # -------------------------
-# TokenStreamWrapper
+# leitura antecipada dos tokens
 # -------------------------
-class TokenStreamWrapper:
+def _drain_tokens(ts: Any) -> List[Token]:
     """
-    Wrapper simples sobre o TokenStream do lexer que adiciona buffering
-    para suportar lookahead (peek(n)) sem consumir tokens do stream original.
+    Lê todo o token stream de uma vez e retorna a lista de tokens terminada
+    em EOF. Usa next_batch(n) quando o stream oferece leitura em lote e
+    next() caso contrário. O parser passa a indexar essa lista diretamente.
     """
-
-    def __init__(self, ts):
-        """
-        Inicializa com um token stream (objeto que tem método next()).
-        _buffer armazena tokens já lidos para permitir peek sem consumir.
-        """
-        self._ts = ts
-        self._buffer = []
-
-    def _fill(self, n: int):
-        """
-        Garante que existam no mínimo n+1 tokens no buffer (0-based).
-        Lê do token stream original conforme necessário.
-        """
-        while len(self._buffer) <= n:
-            t = self._ts.next()
-            self._buffer.append(t)
-
-    def peek(self, n: int = 0):
-        """
-        Retorna o token na posição n do buffer sem consumi-lo.
-        Equivalentemente, fornece lookahead de até n.
-        """
-        self._fill(n)
-        return self._buffer[n]
-
-    def next(self):
-        """
-        Consome e retorna o próximo token.
-        Prefere tokens já buffered; caso contrário, solicita do token stream original.
-        """
-        if self._buffer:
-            return self._buffer.pop(0)
-        return self._ts.next()
-
-    def eof(self):
-        """
-        Verifica se o próximo token é EOF.
-        Usa peek(0) para checagem não-consumptiva.
-        """
-        return getattr(self.peek(0), "tipo", None) == "EOF"
+    next_batch = getattr(ts, "next_batch", None)
+    tokens: List[Token] = []
+    while not tokens or tokens[-1].tipo != "EOF":
+        if next_batch is not None:
+            tokens.extend(next_batch(_BATCH_SIZE))
+        else:
+            tokens.append(ts.next())
+    return tokens
 
 
 # -------------------------
@@ -74,107 +140,238 @@ class Parser:
     """
     Parser LL(1) por descida recursiva.
     Fornece métodos para analisar todas as construções essenciais e retornar
-    uma AST representada por dicionários Python. Erros sintáticos são coletados
-    em self.errors e também impressos.
+    uma AST de nós ast_nodes (to_dict() dá a forma de dicionário). Erros sintáticos são coletados
+    em self.errors (impressos na hora apenas com verbose=True).
     """
 
-    def __init__(self, token_stream):
-        """
-        Inicializa o parser com um token stream (wrapado).
-        Define tokens de sincronização para recuperação em modo pânico.
-        """
-        self.ts = TokenStreamWrapper(token_stream)
-        self.errors: List[str] = []
+    def __init__(self, token_stream: Any, verbose: bool = False) -> None:
+        """
+        Inicializa o parser com um token stream, lido por inteiro para a
+        lista self._tokens (o último token é sempre EOF), com os tipos em
+        paralelo em self._tipos; self._pos é o índice do token atual. Define
+        tokens de sincronização para recuperação em modo pânico. Com
+        verbose=True os erros sintáticos também são impressos na hora.
+        """
+        self._tokens = _drain_tokens(token_stream)
+        self._pos = 0
+        # índice do EOF final: a leitura nunca avança além dele
+        self._last = len(self._tokens) - 1
+        # tipos dos tokens em lista paralela: as checagens de tipo (as mais
+        # frequentes do parser) indexam direto uma lista de str, sem ler o Token
+        self._tipos: List[str] = [t.tipo for t in self._tokens]
+        # erros como tuplas (linha, coluna, mensagem, lexema); o texto só é
+        # montado ao exibir (format_errors / dump_errors)
+        self.errors: List[_ErrorInfo] = []
+        self._verbose = verbose
+        # níveis de parse_expression/parse_statement abertos (ver _MAX_NESTING)
+        self._depth = 0
         # Quando em modo pânico, avançamos até encontrar um destes tokens
-        self._panic_sync_tokens = {"SEMICOLON", "RBRACE", "EOF"}
+        self._panic_sync_tokens = _PANIC_SYNC
+        # nós de erro reaproveitados por lexema (arquivos malformados repetem muito)
+        self._error_cache: Dict[Optional[str], ErrorNode] = {}
+        # Tabelas de despacho (tipo do token -> método já ligado a self), montadas
+        # uma vez por parser: cada decisão vira um dict.get no lugar de uma cadeia
+        # de if/elif. Métodos ligados são atributos comuns, o que também compila
+        # com mypyc (ao contrário de dicts no corpo da classe).
+        self._top_dispatch: Dict[str, _DeclFn] = {
+            "KW_CLASS": self.parse_class_decl,
+            "KW_FUN": self.parse_function_decl,
+            "KW_VAL": self.parse_property_decl,
+            "KW_VAR": self.parse_property_decl,
+        }
+        self._class_member_dispatch: Dict[str, _DeclFn] = {
+            "KW_OBJECT": self.parse_object_decl,
+            "KW_FUN": self.parse_function_decl,
+            "KW_VAL": self.parse_property_decl,
+            "KW_VAR": self.parse_property_decl,
+        }
+        self._object_member_dispatch: Dict[str, _DeclFn] = {
+            "KW_FUN": self.parse_function_decl,
+            "KW_VAL": self.parse_property_decl,
+            "KW_VAR": self.parse_property_decl,
+        }
+        self._statement_dispatch: Dict[str, Callable[[], Node]] = {
+            "KW_VAL": self._parse_local_property,
+            "KW_VAR": self._parse_local_property,
+            "KW_IF": self.parse_if,
+            "KW_FOR": self.parse_for,
+            "LBRACE": self._parse_nested_block,
+        }
+        self._primary_dispatch: Dict[str, Callable[[], Node]] = {
+            "INT_LITERAL": self._parse_literal,
+            "FLOAT_LITERAL": self._parse_literal,
+            "CHAR_LITERAL": self._parse_literal,
+            "STRING_START": self.parse_string_literal,
+            "IDENTIFIER": self.parse_identifier_or_call_or_member,
+            "Quoted_identifier": self.parse_identifier_or_call_or_member,
+            "LPAREN": self._parse_parenthesized,
+        }
 
     # ---- helpers de token
-    def peek(self, n=0): 
-        """Retorna o token de lookahead n sem consumi-lo."""
-        return self.ts.peek(n)
+    def peek(self, n: int = 0) -> Token:
+        """
+        Retorna o token de lookahead n sem consumi-lo.
+        Além do fim, retorna o EOF final.
+        """
+        i = self._pos + n
+        return self._tokens[i if i < self._last else self._last]
+
+    def next(self) -> Token:
+        """
+        Consome e retorna o próximo token.
+        O EOF final nunca é ultrapassado: consumi-lo mantém a posição nele.
+        """
+        pos = self._pos
+        if pos < self._last:
+            self._pos = pos + 1
+        return self._tokens[pos]
 
-    def next(self):
-        """Consome e retorna o próximo token."""
-        return self.ts.next()
+    def eof(self) -> bool:
+        """Verifica se o token atual é EOF."""
+        return self._pos == self._last
+
+    def _peek_tipo(self) -> str:
+        """
+        Retorna o tipo do token atual sem consumi-lo.
+        Atalho para peek().tipo: _pos sempre aponta para um token válido,
+        então é um único acesso à lista de tipos.
+        """
+        return self._tipos[self._pos]
 
-    def accept(self, tipo):
+    def accept(self, tipo: str) -> bool:
         """
         Se o token atual for do tipo esperado, consome-o e retorna True.
         Caso contrário retorna False (sem erro).
         """
-        if getattr(self.peek(), "tipo", None) == tipo:
+        if self._tipos[self._pos] == tipo:
             self.next()
             return True
         return False
 
-    def expect(self, tipo, mensagem=None):
+    def expect(self, tipo: str, mensagem: Optional[str] = None) -> Optional[Token]:
         """
         Se o token atual for do tipo esperado, consome e retorna-o.
         Caso contrário registra erro com a mensagem (ou mensagem padrão),
         tenta recuperação por pânico e retorna None.
         """
-        t = self.peek()
-        if getattr(t, "tipo", None) == tipo:
+        t = self._tokens[self._pos]
+        if t.tipo == tipo:
             return self.next()
-        msg = mensagem or f"Esperado token {tipo}, encontrado {getattr(t,'tipo',None)} ('{getattr(t,'lexema',None)}')"
+        msg = mensagem or f"Esperado token {tipo}, encontrado {t.tipo} ('{t.lexema}')"
         self._error_at_token(t, msg)
         self._panic_recover()
         return None
 
-    def _error_at_token(self, token, mensagem):
+    def _error_at_token(self, token: Token, mensagem: str) -> None:
         """
-        Registra e imprime erro sintático com linha/coluna/lexema do token.
-        Também adiciona a mensagem em self.errors.
+        Registra erro sintático com linha/coluna/lexema do token em self.errors,
+        como tupla (sem formatar texto no meio da análise).
+        Só imprime na hora em modo verbose; caso contrário a saída fica para
+        format_errors() / dump_errors().
         """
-        linha = getattr(token, "linha", -1)
-        coluna = getattr(token, "coluna", -1)
-        lex = getattr(token, "lexema", None)
-        err = f"Erro sintático na linha {linha}, coluna {coluna}: {mensagem} (token='{lex}')"
+        err = (token.linha, token.coluna, mensagem, token.lexema)
         self.errors.append(err)
-        print(err)
+        if self._verbose:
+            print(_format_error(err))
 
-    def _panic_recover(self):
+    def format_errors(self) -> List[str]:
         """
-        Modo pânico: consome tokens até atingir um token de sincronização
-        (por exemplo ';', '}' ou EOF) para reduzir erros em cascata.
+        Retorna as mensagens de erro formatadas, na ordem em que ocorreram.
         """
-        try:
-            while True:
-                t = self.peek()
-                if getattr(t, "tipo", None) in self._panic_sync_tokens:
-                    # se não for EOF, consome o token de sincronização para continuar depois
-                    if getattr(t, "tipo", None) != "EOF":
-                        self.next()
-                    return
-                self.next()
-        except Exception:
-            # Se o token stream falhar (por exemplo EOF inesperado), apenas retorna.
+        return [_format_error(e) for e in self.errors]
+
+    def dump_errors(self, stream: Any = None) -> None:
+        """
+        Escreve de uma vez todos os erros acumulados (padrão: sys.stderr).
+        """
+        if not self.errors:
             return
+        if stream is None:
+            stream = sys.stderr
+        stream.write("\n".join(self.format_errors()) + "\n")
+
+    def _error_node(self, token: Token) -> ErrorNode:
+        """
+        Retorna o nó de erro para o lexema do token, reutilizando a mesma
+        instância para lexemas repetidos (o nó é imutável na AST).
+        """
+        lex = token.lexema
+        node = self._error_cache.get(lex)
+        if node is None:
+            node = self._error_cache[lex] = ErrorNode(lex)
+        return node
+
+    def _panic_recover(self, max_tokens: int = 128) -> None:
+        """
+        Modo pânico: consome tokens até atingir um token de sincronização
+        (por exemplo ';', '}' ou EOF) para reduzir erros em cascata.
+        Como EOF é token de sincronização, o laço nunca passa do fim do stream.
+        Descarta no máximo max_tokens tokens por chamada; se nenhum token de
+        sincronização aparecer antes disso, retorna e o chamador retoma a
+        análise dali (evita varrer o resto do arquivo a cada erro).
+        """
+        peek_tipo = self._peek_tipo
+        sync = self._panic_sync_tokens
+        for _ in range(max_tokens):
+            tipo = peek_tipo()
+            if tipo in sync:
+                # se não for EOF, consome o token de sincronização para continuar depois
+                if tipo != "EOF":
+                    self.next()
+                return
+            self.next()
 
     # -------------------------
     # Entrada principal
     # -------------------------
-    def parse(self):
+    def parse(self) -> KotlinFile:
         """
         Ponto de entrada do parser. Analisa um arquivo Kotlin completo.
-        Retorna um dicionário com chaves: type=kotlinFile, package, imports, declarations.
+        Retorna KotlinFile(package, imports, declarations).
+        A descida recursiva usa até _FRAMES_PER_LEVEL frames por nível de
+        aninhamento (parênteses, blocos), limitado a _MAX_NESTING níveis;
+        durante a análise o limite de recursão do interpretador é elevado para
+        _RECURSION_LIMIT e restaurado no fim. Esse limite é global do processo:
+        com parsers rodando em threads paralelas, uma thread pode restaurar o
+        limite antigo enquanto outra ainda analisa código muito aninhado.
+        """
+        limite_antigo = sys.getrecursionlimit()
+        if limite_antigo < _RECURSION_LIMIT:
+            sys.setrecursionlimit(_RECURSION_LIMIT)
+        try:
+            return self._parse_file()
+        finally:
+            sys.setrecursionlimit(limite_antigo)
+
+    def _parse_file(self) -> KotlinFile:
+        """
+        Laço principal: package, imports e declarações de topo, uma por vez.
+        Se uma declaração aninhar além de _MAX_NESTING níveis (ou do limite de
+        recursão), o erro é registrado e a análise continua na declaração
+        seguinte.
         """
-        file_node = {"type": "kotlinFile", "package": None, "imports": [], "declarations": []}
+        file_node = KotlinFile(None, [], [])
         # package opcional
-        if getattr(self.peek(), "tipo", None) == "KW_PACKAGE":
-            file_node["package"] = self.parse_package_decl()
+        if self._peek_tipo() == "KW_PACKAGE":
+            file_node.package = self.parse_package_decl()
         # imports (0..n)
-        while getattr(self.peek(), "tipo", None) in ("SK_IMPORT", "IMPORT"):
+        while self._peek_tipo() in _IMPORT_KEYWORDS:
             imp = self.parse_import_decl()
-            if imp: file_node["imports"].append(imp)
+            if imp: file_node.imports.append(imp)
         # declarações de topo até EOF
-        while getattr(self.peek(), "tipo", None) != "EOF":
-            decl = self.parse_top_level_decl()
+        while self._peek_tipo() != "EOF":
+            try:
+                decl = self.parse_top_level_decl()
+            except RecursionError:
+                # os níveis abertos foram abandonados pela exceção
+                self._depth = 0
+                self._error_at_token(self.peek(), "Aninhamento excessivo (limite de recursão atingido)")
+                decl = None
             if decl:
-                file_node["declarations"].append(decl)
+                file_node.declarations.append(decl)
             else:
                 # se parse falhar retorna None, sincroniza e tenta continuar
-                if getattr(self.peek(), "tipo", None) == "EOF":
+                if self._peek_tipo() == "EOF":
                     break
                 self._panic_recover()
         return file_node
@@ -182,170 +379,179 @@ class Parser:
     # -------------------------
     # package / import
     # -------------------------
-    def parse_package_decl(self):
+    def parse_package_decl(self) -> PackageDecl:
         """
         Analisa declaração 'package a.b.c;'
-        Retorna um dicionário { type: 'package', name: 'a.b.c' }.
+        Retorna PackageDecl(name='a.b.c').
         """
         self.expect("KW_PACKAGE")
         parts = []
-        if getattr(self.peek(), "tipo", None) == "IDENTIFIER":
+        tipos = self._tipos
+        if tipos[self._pos] == "IDENTIFIER":
             parts.append(self.next().lexema)
-            # parte .ident .ident ...
-            while self.accept("DOT"):
-                if getattr(self.peek(), "tipo", None) == "IDENTIFIER":
+            # parte .ident .ident ... (accept/peek inlinados: DOT nunca é o EOF
+            # final, então avançar _pos direto é seguro)
+            while tipos[self._pos] == "DOT":
+                self._pos += 1
+                if tipos[self._pos] == "IDENTIFIER":
                     parts.append(self.next().lexema)
                 else:
                     self._error_at_token(self.peek(), "Identificador esperado após '.' no package")
                     break
         self.expect("SEMICOLON", "Ponto-e-vírgula esperado após declaração de package")
-        return {"type": "package", "name": ".".join(parts)}
+        # só o nome completo vai para a AST: interna-se o resultado do join
+        # (as partes são descartadas) e nomes repetidos compartilham a string
+        return PackageDecl(_intern(".".join(parts)))
 
-    def parse_import_decl(self):
+    def parse_import_decl(self) -> ImportDecl:
         """
         Analisa declaração 'import ... ;'
         Suporta wildcard '*' no final.
-        Retorna { type: 'import', path: 'a.b.*' }.
+        Retorna ImportDecl(path='a.b.*').
         """
         self.expect("SK_IMPORT")
         parts = []
-        if getattr(self.peek(), "tipo", None) == "IDENTIFIER":
+        tipos = self._tipos
+        if tipos[self._pos] == "IDENTIFIER":
             parts.append(self.next().lexema)
-            while self.accept("DOT"):
-                if getattr(self.peek(), "tipo", None) == "OP_MUL":
-                    parts.append("*"); self.next(); break
-                if getattr(self.peek(), "tipo", None) == "IDENTIFIER":
+            while tipos[self._pos] == "DOT":
+                self._pos += 1
+                t = tipos[self._pos]
+                if t == "OP_MUL":
+                    parts.append("*"); self._pos += 1; break
+                if t == "IDENTIFIER":
                     parts.append(self.next().lexema)
                 else:
                     self._error_at_token(self.peek(), "Identificador esperado no import"); break
         self.expect("SEMICOLON", "Ponto-e-vírgula esperado após import")
-        return {"type": "import", "path": ".".join(parts)}
+        # imports idênticos (ex.: kotlin.collections.*) compartilham o mesmo path
+        return ImportDecl(_intern(".".join(parts)))
 
     # -------------------------
     # top-level
     # -------------------------
-    def parse_top_level_decl(self):
+    def parse_top_level_decl(self) -> Optional[Node]:
         """
         Decide qual declaração de topo começar a partir do token atual:
         - class / fun / property / semicolon (ignorado) / ou erro.
         Retorna o nó da AST correspondente ou None se nada foi produzido.
         """
         mods = self._collect_modifiers()
-        t = getattr(self.peek(), "tipo", None)
-        if t == "KW_CLASS": return self.parse_class_decl(mods)
-        if t == "KW_FUN": return self.parse_function_decl(mods)
-        if t in ("KW_VAL","KW_VAR"): return self.parse_property_decl(mods)
+        t = self._peek_tipo()
+        fn = self._top_dispatch.get(t)
+        if fn: return fn(mods)
         if t == "SEMICOLON": self.next(); return None
         self._error_at_token(self.peek(), "Declaração de topo inválida"); self._panic_recover(); return None
 
-    def _collect_modifiers(self):
+    def _collect_modifiers(self) -> Sequence[str]:
         """
-        Coleta modificadores (tokens cujo tipo começa com 'MOD_') e retorna uma lista
-        com seus lexemas. Não consome nada que não seja modificador.
+        Coleta modificadores (tokens MOD_*) e retorna uma lista com seus lexemas
+        (ou _EMPTY quando não há nenhum). Não consome nada que não seja
+        modificador. O teste é uma busca no frozenset _MODIFIER_TOKENS em vez
+        de str.startswith por token.
         """
+        peek_tipo = self._peek_tipo
+        if peek_tipo() not in _MODIFIER_TOKENS:
+            return _EMPTY
         mods=[]
-        while getattr(self.peek(), "tipo", None) and getattr(self.peek(), "tipo", None).startswith("MOD_"):
-            mods.append(self.next().lexema)
+        while peek_tipo() in _MODIFIER_TOKENS:
+            mods.append(_intern(self.next().lexema))
         return mods
 
     # -------------------------
     # class / object
     # -------------------------
-    def parse_class_decl(self, modifiers):
+    def parse_class_decl(self, modifiers: Sequence[str]) -> ClassDecl:
         """
         Analisa declaração de classe:
         'class IDENTIFIER { members }'
-        Retorna { type: 'class', name: ..., modifiers: [...], body: [...] }.
+        Retorna ClassDecl(name, modifiers, body).
         """
         self.expect("KW_CLASS")
         name_tok = self.expect("IDENTIFIER", "Nome da classe esperado após 'class'")
-        name = getattr(name_tok,"lexema",None) if name_tok else "<erro>"
+        name = _intern(name_tok.lexema) if name_tok else "<erro>"
         body=None
         if self.accept("LBRACE"):
             members=[]
             # analisa membros até '}' ou EOF
-            while getattr(self.peek(),"tipo",None) not in ("RBRACE","EOF"):
-                # se houver modificadores, tratamos membros com modificadores
-                if getattr(self.peek(),"tipo",None).startswith("MOD_"):
-                    member_mods = self._collect_modifiers()
-                    if getattr(self.peek(),"tipo",None) == "KW_OBJECT":
-                        members.append(self.parse_object_decl(member_mods)); continue
-                    if getattr(self.peek(),"tipo",None) in ("KW_VAL","KW_VAR"):
-                        members.append(self.parse_property_decl(member_mods)); continue
-                    if getattr(self.peek(),"tipo",None) == "KW_FUN":
-                        members.append(self.parse_function_decl(member_mods)); continue
-                # membros sem modificadores
-                if getattr(self.peek(),"tipo",None) in ("KW_VAL","KW_VAR"):
-                    members.append(self.parse_property_decl([])); continue
-                if getattr(self.peek(),"tipo",None) == "KW_FUN":
-                    members.append(self.parse_function_decl([])); continue
-                if getattr(self.peek(),"tipo",None) == "KW_OBJECT":
-                    members.append(self.parse_object_decl([])); continue
+            peek_tipo = self._peek_tipo
+            dispatch = self._class_member_dispatch
+            collect_modifiers = self._collect_modifiers
+            while peek_tipo() not in _BLOCK_END:
+                # modificadores (se houver) e então o membro via tabela de despacho
+                member_mods = collect_modifiers()
+                fn = dispatch.get(peek_tipo())
+                if fn:
+                    members.append(fn(member_mods)); continue
                 # se não reconhecido, erro e tentativa de recuperação
                 self._error_at_token(self.peek(),"Membro de classe não reconhecido (ignorado)"); self._panic_recover()
             self.expect("RBRACE","Fechamento '}' esperado no corpo da classe")
-            body=members
-        return {"type":"class","name":name,"modifiers":modifiers,"body":body}
+            body=members or _EMPTY
+        return ClassDecl(name, modifiers, body)
 
-    def parse_object_decl(self, modifiers):
+    def parse_object_decl(self, modifiers: Sequence[str]) -> ObjectDecl:
         """
         Analisa 'object' (possivelmente 'companion object') com corpo e membros.
-        Retorna { type:'object', name:?, modifiers:..., members: [...] }.
+        Retorna ObjectDecl(name?, modifiers, members).
         """
         self.expect("KW_OBJECT")
         name=None
         # object pode ter nome opcional (por ex. object Foo { ... })
-        if getattr(self.peek(),"tipo",None)=="IDENTIFIER": name=self.next().lexema
+        if self._peek_tipo()=="IDENTIFIER": name=_intern(self.next().lexema)
         members=[]
         if self.accept("LBRACE"):
-            while getattr(self.peek(),"tipo",None) not in ("RBRACE","EOF"):
-                if getattr(self.peek(),"tipo",None).startswith("MOD_"):
-                    mem_mods=self._collect_modifiers()
-                    if getattr(self.peek(),"tipo",None) in ("KW_VAL","KW_VAR"):
-                        members.append(self.parse_property_decl(mem_mods)); continue
-                if getattr(self.peek(),"tipo",None) in ("KW_VAL","KW_VAR"):
-                    members.append(self.parse_property_decl([])); continue
-                if getattr(self.peek(),"tipo",None) == "KW_FUN":
-                    members.append(self.parse_function_decl([])); continue
+            peek_tipo = self._peek_tipo
+            dispatch = self._object_member_dispatch
+            collect_modifiers = self._collect_modifiers
+            while peek_tipo() not in _BLOCK_END:
+                mem_mods=collect_modifiers()
+                fn = dispatch.get(peek_tipo())
+                if fn:
+                    members.append(fn(mem_mods)); continue
                 self._error_at_token(self.peek(),"Membro do object não reconhecido"); self._panic_recover()
             self.expect("RBRACE","Fechamento '}' esperado no object")
-        return {"type":"object","name":name,"modifiers":modifiers,"members":members}
+        return ObjectDecl(name, modifiers, members or _EMPTY)
 
     # -------------------------
     # function
     # -------------------------
-    def parse_function_decl(self, modifiers):
+    def parse_function_decl(self, modifiers: Sequence[str]) -> FunctionDecl:
         """
         Analisa declaração de função:
         'fun IDENTIFIER ( params ) (: return_type)? ( { body } | ; )'
-        Retorna nó do tipo 'function' com params, return e body (block ou None).
+        Retorna FunctionDecl com params, return_type e body (Block ou None).
         """
         self.expect("KW_FUN")
         name_tok=self.expect("IDENTIFIER","Nome da função esperado")
-        name=getattr(name_tok,"lexema",None) if name_tok else "<erro>"
+        name=_intern(name_tok.lexema) if name_tok else "<erro>"
         params=[]
         self.expect("LPAREN","Esperado '(' em declaração de função")
         # parâmetros separados por vírgula
-        if getattr(self.peek(),"tipo",None) != "RPAREN":
+        peek_tipo = self._peek_tipo
+        t = peek_tipo()
+        if t != "RPAREN":
             while True:
-                if getattr(self.peek(),"tipo",None) == "IDENTIFIER":
-                    p=self.next().lexema
+                if t == "IDENTIFIER":
+                    p=_intern(self.next().lexema)
                     if self.accept("COLON"):
-                        if getattr(self.peek(),"tipo",None)=="IDENTIFIER":
-                            p_type=self.next().lexema
+                        if peek_tipo()=="IDENTIFIER":
+                            p_type=_intern(self.next().lexema)
                             if self.accept("QUESTION"): p_type = p_type + "?"
                         else: p_type=None
                     else: p_type=None
-                    params.append({"name":p,"type":p_type})
+                    params.append(Param(p, p_type))
                 else:
                     self._error_at_token(self.peek(),"Parâmetro inválido"); self._panic_recover(); break
-                if not self.accept("COMMA"): break
+                # accept("COMMA") inlinado
+                if self._tipos[self._pos] != "COMMA": break
+                self._pos += 1
+                t = peek_tipo()
         self.expect("RPAREN","Esperado ')' após parâmetros")
         # tipo de retorno opcional
         rettype=None
         if self.accept("COLON"):
-            if getattr(self.peek(),"tipo",None)=="IDENTIFIER":
-                rettype=self.next().lexema
+            if self._peek_tipo()=="IDENTIFIER":
+                rettype=_intern(self.next().lexema)
                 if self.accept("QUESTION"): rettype = rettype + "?"
             else:
                 self._error_at_token(self.peek(),"Tipo de retorno esperado após ':'")
@@ -353,32 +559,35 @@ class Parser:
         body=None
         if self.accept("LBRACE"): body=self.parse_block()
         else:
-            if getattr(self.peek(),"tipo",None)=="SEMICOLON": self.next()
-        return {"type":"function","name":name,"modifiers":modifiers,"params":params,"return":rettype,"body":body}
+            if self._peek_tipo()=="SEMICOLON": self.next()
+        return FunctionDecl(name, modifiers, params or _EMPTY, rettype, body)
 
     # -------------------------
     # property (destructuring + tolerância)
     # -------------------------
-    def parse_property_decl(self, modifiers):
+    def parse_property_decl(self, modifiers: Sequence[str]) -> Node:
         """
         Analisa declaração de propriedade local ou de classe:
         - Suporta desestruturação: var (a, b) = expr;
         - Suporta 'val' / 'var' IDENTIFIER (':' type)? ('=' expr)? ';'
         - Implementa recuperação tolerante quando ':' é seguido por um literal (ex: var x: 1;)
-        Retorna nó 'property' ou 'destructuring'.
+        Retorna PropertyDecl ou Destructuring.
         """
         kind = self.next().tipo  # KW_VAL ou KW_VAR
+        # tipo do token seguinte, usado pelas duas decisões abaixo
+        t = self._peek_tipo()
 
         # destruturação: var (a,b) = expr;
-        if getattr(self.peek(),"tipo",None) == "LPAREN":
+        if t == "LPAREN":
             self.next()
             parts=[]
-            while getattr(self.peek(),"tipo",None) not in ("RPAREN","EOF"):
-                if getattr(self.peek(),"tipo",None)=="IDENTIFIER":
-                    parts.append(self.next().lexema)
+            while self._peek_tipo() not in _PAREN_END:
+                if self._peek_tipo()=="IDENTIFIER":
+                    parts.append(_intern(self.next().lexema))
                 else:
                     self._error_at_token(self.peek(),"Identificador esperado em destruturação"); self._panic_recover(); break
-                if not self.accept("COMMA"): break
+                if self._tipos[self._pos] != "COMMA": break
+                self._pos += 1
             self.expect("RPAREN","')' esperado na destruturação")
             value=None
             if self.accept("OP_ASSIGN"):
@@ -386,12 +595,12 @@ class Parser:
             else:
                 self._error_at_token(self.peek(),"Atribuição esperada em destruturação"); self._panic_recover()
             self.expect("SEMICOLON","Ponto-e-vírgula esperado ao final da declaração")
-            return {"type":"destructuring","kind":kind,"parts":parts,"value":value,"modifiers":modifiers}
+            return Destructuring(kind, parts, value, modifiers)
 
         # nome pode ser IDENTIFIER ou Quoted_identifier
-        if getattr(self.peek(),"tipo",None) in ("IDENTIFIER","Quoted_identifier"):
+        if t in _NAME_TOKENS:
             name_tok = self.next()
-            name = name_tok.lexema
+            name = _intern(name_tok.lexema)
         else:
             name_tok = None
             self._error_at_token(self.peek(),"Nome da propriedade esperado")
@@ -401,15 +610,15 @@ class Parser:
         var_type = None
         # se houver ':' — tentar ler tipo; em caso de token inesperado, aplicar tolerância
         if self.accept("COLON"):
-            if getattr(self.peek(),"tipo",None) == "IDENTIFIER":
-                var_type = self.next().lexema
+            if self._peek_tipo() == "IDENTIFIER":
+                var_type = _intern(self.next().lexema)
                 if self.accept("QUESTION"):
                     var_type = var_type + "?"
             else:
                 # Caso tolerante: se o próximo token for início de expressão (literal/ident/LPAREN),
                 # tratamos como erro menor (provável que autor quis escrever '=').
-                t_next = getattr(self.peek(),"tipo",None)
-                if t_next in ("INT_LITERAL","FLOAT_LITERAL","STRING_START","CHAR_LITERAL","IDENTIFIER","LPAREN"):
+                t_next = self._peek_tipo()
+                if t_next in _EXPR_STARTERS:
                     self._error_at_token(self.peek(), "Tipo esperado após ':' — assumindo iniacializador (recuperação tolerante).")
                     var_type = None
                     # parse_expression() consumirá o token correto como inicializador se aplicável
@@ -423,34 +632,36 @@ class Parser:
         else:
             # Se aplicamos a recuperação tolerante acima, e o próximo token parece ser uma expressão,
             # tentamos consumi-lo como valor automaticamente.
-            if var_type is None and getattr(self.peek(),"tipo",None) in ("INT_LITERAL","FLOAT_LITERAL","STRING_START","CHAR_LITERAL","IDENTIFIER","LPAREN"):
+            if var_type is None and self._peek_tipo() in _EXPR_STARTERS:
                 value = self.parse_expression()
 
         # exigir ';' ao final da propriedade
-        if getattr(self.peek(),"tipo",None) == "SEMICOLON":
+        if self._peek_tipo() == "SEMICOLON":
             self.next()
         else:
             self._error_at_token(self.peek(),"Ponto-e-vírgula esperado ao final da declaração de propriedade")
             self._panic_recover()
-        return {"type":"property","kind":kind,"name":name,"var_type":var_type,"value":value,"modifiers":modifiers}
+        return PropertyDecl(kind, name, var_type, value, modifiers)
 
     # -------------------------
     # blocks / statements
     # -------------------------
-    def parse_block(self):
+    def parse_block(self) -> Block:
         """
         Analisa um bloco '{ ... }' — coleta statements até encontrar '}'.
-        Retorna nó do tipo 'block' com lista de statements.
+        Retorna Block com a lista de statements.
         """
         stmts=[]
-        while getattr(self.peek(),"tipo",None) not in ("RBRACE","EOF"):
-            st=self.parse_statement()
+        peek_tipo = self._peek_tipo
+        parse_statement = self.parse_statement
+        while peek_tipo() not in _BLOCK_END:
+            st=parse_statement()
             if st: stmts.append(st)
             else: self._panic_recover()
         self.expect("RBRACE","Fechamento de bloco '}' esperado")
-        return {"type":"block","statements":stmts}
+        return Block(stmts)
 
-    def parse_statement(self):
+    def parse_statement(self) -> Node:
         """
         Analisa uma instrução:
         - Declaração local (val/var)
@@ -459,161 +670,150 @@ class Parser:
         - expressão seguida de ';'
         Retorna o nó correspondente.
         """
-        t = getattr(self.peek(),"tipo",None)
-        if t in ("KW_VAL","KW_VAR"): return self.parse_property_decl([])
-        if t == "KW_IF": return self.parse_if()
-        if t == "KW_FOR": return self.parse_for()
-        if t == "LBRACE": self.next(); return self.parse_block()
-        # expressão-; padrão
-        expr = self.parse_expression()
-        if getattr(self.peek(),"tipo",None) == "SEMICOLON": self.next()
+        depth = self._enter_nesting()
+        fn = self._statement_dispatch.get(self._peek_tipo())
+        if fn:
+            node = fn()
         else:
-            self._error_at_token(self.peek(),"Ponto-e-vírgula esperado ao final da instrução"); self._panic_recover()
-        return {"type":"expr_stmt","expr":expr}
+            # expressão-; padrão
+            expr = self.parse_expression()
+            if self._peek_tipo() == "SEMICOLON": self.next()
+            else:
+                self._error_at_token(self.peek(),"Ponto-e-vírgula esperado ao final da instrução"); self._panic_recover()
+            node = ExprStmt(expr)
+        self._depth = depth - 1
+        return node
+
+    def _enter_nesting(self) -> int:
+        """
+        Abre um nível de aninhamento e retorna a nova profundidade (o chamador
+        a decrementa ao sair). Acima de _MAX_NESTING levanta RecursionError,
+        tratado em _parse_file como nos estouros de recursão do Python puro.
+        """
+        depth = self._depth + 1
+        if depth > _MAX_NESTING:
+            raise RecursionError("aninhamento acima de _MAX_NESTING")
+        self._depth = depth
+        return depth
+
+    def _parse_local_property(self) -> Node:
+        """Declaração local val/var (sem modificadores)."""
+        return self.parse_property_decl(_EMPTY)
 
-    def parse_if(self):
+    def _parse_nested_block(self) -> Block:
+        """Bloco aninhado: consome '{' e analisa o bloco."""
+        self.next()
+        return self.parse_block()
+
+    def parse_if(self) -> IfStmt:
         """
         Analisa uma instrução if (cond) then (else?).
-        Retorna nó { type:'if', cond, then, else }.
+        Retorna IfStmt(cond, then, else_).
         """
         self.expect("KW_IF")
         self.expect("LPAREN","Esperado '(' após if")
         cond = self.parse_expression()
         self.expect("RPAREN","Esperado ')' após condição do if")
-        then_node = None
-        if getattr(self.peek(),"tipo",None) == "LBRACE": self.next(); then_node=self.parse_block()
+        then_node: Optional[Node] = None
+        if self._peek_tipo() == "LBRACE": self.next(); then_node=self.parse_block()
         else: then_node=self.parse_statement()
-        else_node=None
-        if getattr(self.peek(),"tipo",None)=="KW_ELSE":
+        else_node: Optional[Node] = None
+        if self._peek_tipo()=="KW_ELSE":
             self.next()
-            if getattr(self.peek(),"tipo",None)=="LBRACE": self.next(); else_node=self.parse_block()
+            if self._peek_tipo()=="LBRACE": self.next(); else_node=self.parse_block()
             else: else_node=self.parse_statement()
-        return {"type":"if","cond":cond,"then":then_node,"else":else_node}
+        return IfStmt(cond, then_node, else_node)
 
-    def parse_for(self):
+    def parse_for(self) -> ForStmt:
         """
         Analisa 'for ( id in range ) body'.
-        Retorna nó { type:'for', var: id, range: expr, body: ... }.
+        Retorna ForStmt(var, range, body).
         """
         self.expect("KW_FOR")
         self.expect("LPAREN","Esperado '(' após for")
         var_name=None
-        if getattr(self.peek(),"tipo",None)=="IDENTIFIER": var_name=self.next().lexema
+        if self._peek_tipo()=="IDENTIFIER": var_name=_intern(self.next().lexema)
         else: self._error_at_token(self.peek(),"Identificador de iteração esperado")
         if self.accept("KW_IN"): rng=self.parse_expression()
         else: rng=None
         self.expect("RPAREN","Esperado ')' após cabeçalho do for")
-        body=None
+        body: Optional[Node] = None
         if self.accept("LBRACE"): body=self.parse_block()
         else: body=self.parse_statement()
-        return {"type":"for","var":var_name,"range":rng,"body":body}
+        return ForStmt(var_name, rng, body)
 
     # -------------------------
-    # expressões (com elvis)
+    # expressões (precedence climbing)
     # -------------------------
-    def parse_expression(self):
+    def parse_expression(self) -> Node:
         """
-        Entrada para análise de expressão. No parser essencial, a expressão
-        principal implementada é 'elvis' (que engloba toda a precedência).
+        Entrada para análise de expressão. Começa no nível de menor precedência
+        (elvis '?:'), englobando toda a tabela de operadores binários.
+        Conta um nível de aninhamento (ver _enter_nesting).
         """
-        return self.parse_elvis()
-
-    def parse_elvis(self):
-        """
-        Analisa expressão com operador Elvis '?:' (nível mais alto).
-        Implementa associatividade à esquerda via loop.
-        """
-        node = self.parse_or()
-        while getattr(self.peek(),"tipo",None) == "OP_ELVIS":
-            op = self.next().lexema
-            right = self.parse_or()
-            node = {"type":"binary","op":op,"left":node,"right":right}
-        return node
-
-    def parse_or(self):
-        """
-        Analisa '||' (OR lógico) com precedência apropriada.
-        """
-        node = self.parse_and()
-        while getattr(self.peek(),"tipo",None) == "OP_OR":
-            op=self.next().lexema; right=self.parse_and(); node={"type":"binary","op":op,"left":node,"right":right}
+        depth = self._enter_nesting()
+        node = self.parse_binary(1)
+        self._depth = depth - 1
         return node
 
-    def parse_and(self):
-        """
-        Analisa '&&' (AND lógico).
-        """
-        node=self.parse_equality()
-        while getattr(self.peek(),"tipo",None)=="OP_AND":
-            op=self.next().lexema; right=self.parse_equality(); node={"type":"binary","op":op,"left":node,"right":right}
-        return node
-
-    def parse_equality(self):
-        """
-        Analisa operadores de igualdade/inequalidade (==, !=, ===, !==).
-        """
-        node=self.parse_relational()
-        while getattr(self.peek(),"tipo",None) in ("OP_NEQ","OP_EQ","OP_EQ_STRICT","OP_NEQ_STRICT"):
-            op_tok=self.next(); right=self.parse_relational(); node={"type":"binary","op":op_tok.lexema,"left":node,"right":right}
-        return node
-
-    def parse_relational(self):
-        """
-        Analisa operadores relacionais e palavras-chave relacionais:
-        in, !in, is, !is, as (e as?), >=, <=, >, <, range '..' e '..<'.
-        Observa uso de peek(1) para reconhecer sequências como '! in'.
-        """
-        node=self.parse_additive()
+    def parse_binary(self, min_prec: int) -> Node:
+        """
+        Analisa expressões binárias por precedence climbing guiado por _BINOP_PREC,
+        substituindo a antiga escada elvis/or/and/equality/relational/additive/
+        multiplicative (um frame por nível mesmo sem operador).
+        Todos os operadores são associativos à esquerda: o operando direito é
+        analisado com precedência mínima prec+1.
+        Casos especiais do nível relacional: '! in' / '! is' (OP_NOT seguido de
+        KW_IN/KW_IS, via peek(1)) e 'as?' (KW_AS seguido de QUESTION).
+        Métodos e a tabela são ligados a locais na entrada, evitando a busca de
+        atributo a cada iteração do laço.
+        """
+        peek_tipo = self._peek_tipo
+        nxt = self.next
+        parse_binary = self.parse_binary
+        prec_of = _BINOP_PREC.get
+        node = self.parse_unary()
         while True:
-            t0 = getattr(self.peek(),"tipo",None); t1 = getattr(self.peek(1),"tipo",None)
-            op=None
-            if t0=="OP_NOT" and t1 in ("KW_IN","KW_IS"):
-                # reconhece '! in' ou '! is'
-                self.next(); op_tok=self.next(); op='!'+op_tok.lexema
-            elif t0 in ("KW_IN","KW_IS","KW_AS"):
-                op_tok=self.next(); op=op_tok.lexema
-                # 'as?' é um operador especial (cast seguro)
-                if op=="as" and getattr(self.peek(),"tipo",None)=="QUESTION": self.next(); op="as?"
-            elif t0 in ("OP_GE","OP_LE","OP_GT","OP_LT","OP_RANGE","OP_RANGE_UNTIL"):
-                op_tok=self.next(); op=op_tok.lexema
-            else:
+            t = peek_tipo()
+            prec = prec_of(t)
+            if prec is None:
+                # '! in' / '! is' só são operadores quando o '!' precede in/is
+                if t == "OP_NOT" and self.peek(1).tipo in _NEGATABLE_KEYWORDS:
+                    prec = _REL_PREC
+                else:
+                    break
+            if prec < min_prec:
                 break
-            right = self.parse_additive()
-            node = {"type":"binary","op":op,"left":node,"right":right}
-        return node
-
-    def parse_additive(self):
-        """
-        Analisa operações aditivas: +, -, +=, -= (nota: += e -= tratados como binários aqui).
-        """
-        node=self.parse_multiplicative()
-        while getattr(self.peek(),"tipo",None) in ("OP_PLUS","OP_MINUS","OP_PLUS_ASSIGN","OP_MINUS_ASSIGN"):
-            op_tok=self.next(); right=self.parse_multiplicative(); node={"type":"binary","op":op_tok.lexema,"left":node,"right":right}
-        return node
-
-    def parse_multiplicative(self):
-        """
-        Analisa operações multiplicativas: *, /, %.
-        """
-        node=self.parse_unary()
-        while getattr(self.peek(),"tipo",None) in ("OP_MUL","OP_DIV","OP_MOD"):
-            op_tok=self.next(); right=self.parse_unary(); node={"type":"binary","op":op_tok.lexema,"left":node,"right":right}
+            op = nxt().lexema
+            if t == "OP_NOT":
+                op = '!' + nxt().lexema
+            elif t == "KW_AS" and peek_tipo() == "QUESTION":
+                # 'as?' é um operador especial (cast seguro)
+                nxt(); op = "as?"
+            right = parse_binary(prec + 1)
+            node = BinOp(op, node, right)
         return node
 
-    def parse_unary(self):
+    def parse_unary(self) -> Node:
         """
         Analisa operadores unários: !, - (prefixo).
         Também transforma pós-fixos ++/-- em nós 'postfix' após parse_primary.
-        """
-        t = getattr(self.peek(),"tipo",None)
-        if t in ("OP_NOT","OP_MINUS"):
-            op=self.next().lexema; operand=self.parse_unary(); return {"type":"unary","op":op,"operand":operand}
+        Prefixos consecutivos (ex.: !!x, - -x) são acumulados num laço em vez de
+        recursão, e aplicados de dentro para fora sobre o operando.
+        """
+        peek_tipo = self._peek_tipo
+        nxt = self.next
+        ops = []
+        while peek_tipo() in _PREFIX_OPS:
+            ops.append(nxt().lexema)
         node=self.parse_primary()
-        if getattr(self.peek(),"tipo",None) in ("OP_INC","OP_DEC"):
-            op=self.next().lexema; return {"type":"postfix","op":op,"operand":node}
+        if peek_tipo() in _POSTFIX_OPS:
+            node = Postfix(nxt().lexema, node)
+        for op in reversed(ops):
+            node = Unary(op, node)
         return node
 
-    def parse_primary(self):
+    def parse_primary(self) -> Node:
         """
         Analisa primários:
         - Literais (int, float, char)
@@ -622,91 +822,109 @@ class Parser:
         - Parênteses (expressão entre '(' ')')
         Em caso de token inválido, gera erro e retorna nó 'error'.
         """
-        t = getattr(self.peek(),"tipo",None)
-        if t in ("INT_LITERAL","FLOAT_LITERAL","CHAR_LITERAL"):
-            token=self.next(); return {"type":"literal","kind":token.tipo,"value":token.valor}
-        if t == "STRING_START": return self.parse_string_literal()
-        if t in ("IDENTIFIER","Quoted_identifier"): return self.parse_identifier_or_call_or_member()
-        if t == "LPAREN": self.next(); expr=self.parse_expression(); self.expect("RPAREN","')' esperado"); return expr
-        tok=self.next(); self._error_at_token(tok,"Expressão primária inválida"); return {"type":"error","token":getattr(tok,"lexema",None)}
+        fn = self._primary_dispatch.get(self._peek_tipo())
+        if fn: return fn()
+        tok=self.next(); self._error_at_token(tok,"Expressão primária inválida"); return self._error_node(tok)
+
+    def _parse_literal(self) -> Literal:
+        """Literal int/float/char."""
+        token=self.next()
+        return Literal(token.tipo, token.valor)
 
-    def parse_string_literal(self):
+    def _parse_parenthesized(self) -> Node:
+        """Expressão entre parênteses: '(' expr ')'."""
+        self.next()
+        expr=self.parse_expression()
+        self.expect("RPAREN","')' esperado")
+        return expr
+
+    def parse_string_literal(self) -> StringLit:
         """
         Analisa strings, incluindo partes de texto e interpolação:
         - STRING_TEXT
         - STRING_INTERP_ID (ex: $id)
         - STRING_INTERP_EXPR (ex: ${ expr })
-        Retorna nó { type: 'string', parts: [...] }.
+        Retorna StringLit(parts).
         """
         self.expect("STRING_START")
-        parts=[]
-        while getattr(self.peek(),"tipo",None) not in ("STRING_END","EOF"):
-            t=self.next()
-            if getattr(t,"tipo",None)=="STRING_TEXT":
-                parts.append({"type":"text","value":t.valor})
-            elif getattr(t,"tipo",None)=="STRING_INTERP_ID":
-                parts.append({"type":"interp_id","name":t.lexema})
-            elif getattr(t,"tipo",None)=="STRING_INTERP_START":
+        parts: List[Node] = []
+        peek_tipo = self._peek_tipo
+        nxt = self.next
+        while peek_tipo() not in _STRING_END:
+            t=nxt()
+            tt=t.tipo
+            if tt=="STRING_TEXT":
+                parts.append(TextPart(t.valor))
+            elif tt=="STRING_INTERP_ID":
+                parts.append(InterpId(_intern(t.lexema)))
+            elif tt=="STRING_INTERP_START":
                 # espera o token STRING_INTERP_EXPR contendo o texto da expressão interpolada
-                if getattr(self.peek(),"tipo",None)=="STRING_INTERP_EXPR":
-                    expr_tok=self.next(); parts.append({"type":"interp_expr","expr_text":expr_tok.lexema})
+                if peek_tipo()=="STRING_INTERP_EXPR":
+                    expr_tok=nxt(); parts.append(InterpExpr(expr_tok.lexema))
                 # consome o '}' de interpolação
-                if getattr(self.peek(),"tipo",None)=="STRING_INTERP_END": self.next()
+                if peek_tipo()=="STRING_INTERP_END": nxt()
                 else: self._error_at_token(self.peek(),"Fim de interpolação esperado ('}')"); self._panic_recover()
             else:
                 # caso inesperado dentro da string
-                parts.append({"type":"unknown","token":getattr(t,"lexema",None)})
+                parts.append(UnknownPart(t.lexema))
         self.expect("STRING_END","Fim de string esperado")
-        return {"type":"string","parts":parts}
+        return StringLit(parts)
 
     # -------------------------
     # identificador / chamadas / membros
     # -------------------------
-    def parse_identifier_or_call_or_member(self):
+    def parse_identifier_or_call_or_member(self) -> Node:
         """
         Analisa:
         - IDENTIFIER (ou Quoted_identifier)
         - possivelmente seguida de chamada: '(' args ')'
         - ou sequência de membro: '.' IDENTIFIER, '?.' IDENTIFIER, '!!' '.' IDENTIFIER
-        Retorna nós do tipo 'identifier', 'call' ou 'member' encadeados.
+        Retorna nós Identifier, Call ou Member encadeados.
         """
-        # IDENTIFIER ou Quoted_identifier inicial
-        if getattr(self.peek(),"tipo",None) in ("IDENTIFIER","Quoted_identifier"):
-            node = {"type":"identifier","name":self.next().lexema}
+        # IDENTIFIER ou Quoted_identifier inicial (o token é consumido nos dois casos)
+        tok = self.next()
+        if tok.tipo in _NAME_TOKENS:
+            node: Node = Identifier(_intern(tok.lexema))
         else:
-            tok=self.next(); self._error_at_token(tok,"Identificador esperado"); return {"type":"error","token":getattr(tok,"lexema",None)}
+            self._error_at_token(tok,"Identificador esperado"); return self._error_node(tok)
 
+        # o tipo do próximo token é lido uma vez por iteração e reaproveitado
+        peek_tipo = self._peek_tipo
+        nxt = self.next
         while True:
-            ttype = getattr(self.peek(),"tipo",None)
+            ttype = peek_tipo()
             # chamada de função: (...args...)
             if ttype == "LPAREN":
-                self.next()
+                nxt()
                 args=[]
-                if getattr(self.peek(),"tipo",None) != "RPAREN":
+                if peek_tipo() != "RPAREN":
+                    parse_expression = self.parse_expression
+                    tipos = self._tipos
                     while True:
-                        args.append(self.parse_expression())
-                        if not self.accept("COMMA"): break
+                        args.append(parse_expression())
+                        # accept("COMMA") inlinado
+                        if tipos[self._pos] != "COMMA": break
+                        self._pos += 1
                 self.expect("RPAREN","')' esperado após argumentos de chamada")
-                node = {"type":"call","callee":node,"args":args}
+                node = Call(node, args)
                 continue
 
             # membros/operadores de acesso: DOT / OP_SAFE_CALL (?.) / OP_NOT_NULL (!!)
-            elif ttype in ("DOT","OP_SAFE_CALL","OP_NOT_NULL"):
-                op_tok = self.next()  # consome o token de operador
+            elif ttype in _MEMBER_OPS:
+                op_tok = nxt()  # consome o token de operador
                 op = op_tok.lexema
 
                 # HACK/Tolerância: em alguns cenários o lexer pode emitir '!!' seguido por '.'
                 # como tokens separados; aqui detectamos OP_NOT_NULL e consumimos um DOT subsequente
                 # para aceitar sequências como 'nome!! .length'.
-                if op_tok.tipo == "OP_NOT_NULL and getattr(op_tok,'tipo',None)" or op_tok.tipo == "OP_NOT_NULL":
-                    if getattr(self.peek(),"tipo",None) == "DOT":
-                        # consumimos o DOT adicional para unificar o padrão
-                        self.next()
+                if ttype == "OP_NOT_NULL" and peek_tipo() == "DOT":
+                    # consumimos o DOT adicional para unificar o padrão
+                    nxt()
 
                 # agora esperamos o nome do membro (IDENTIFIER ou Quoted_identifier)
-                if getattr(self.peek(),"tipo",None) in ("IDENTIFIER","Quoted_identifier"):
-                    member = self.next().lexema
-                    node = {"type":"member","target":node,"op":op,"member":member}
+                if peek_tipo() in _NAME_TOKENS:
+                    member = _intern(nxt().lexema)
+                    node = Member(node, op, member)
                     continue
                 else:
                     # erro de membro ausente; tenta recuperação
@@ -717,3 +935,4 @@ class Parser:
                 # nenhum operador de chamada/membro seguinte — fim do encadeamento
                 break
         return node
+
@@ -1,18 +1,26 @@
 from .tokens import Token
 from .tokens import Token as _TokenClass  #util para type hints dos metodos de uma classe
 
+# token EOF único devolvido ao ler além do fim (ou antes do início) do stream
+EOF_TOKEN = Token("EOF", "", None, -1, -1)
+
 class TokenStream:
     def __init__(self, lexer):
         # lexer is instance of Lexer
         self.tokens = lexer.tokenize()
         self.pos = 0
+        # ao passar do fim, repete o EOF emitido pelo lexer (mantém linha/coluna reais)
+        if self.tokens and self.tokens[-1].tipo == "EOF":
+            self._eof = self.tokens[-1]
+        else:
+            self._eof = EOF_TOKEN
 
     def peek(self, n=0):
         idx = self.pos + n
         if idx < 0:
-            return Token("EOF", "", -1, -1)
+            return EOF_TOKEN
         if idx >= len(self.tokens):
-            return Token("EOF", "", -1, -1)
+            return self._eof
         return self.tokens[idx]
 
     def next(self):
@@ -20,6 +28,15 @@ class TokenStream:
         self.pos += 1
         return tok
 
+    def next_batch(self, n=64):
+        # consome e retorna até n tokens de uma vez (fatia da lista já lexada),
+        # para quem faz buffering não pagar uma chamada de método por token
+        lote = self.tokens[self.pos:self.pos + n]
+        if not lote:
+            return [self.next()]
+        self.pos += len(lote)
+        return lote
+
     def match(self, tipo):
         if self.peek().tipo == tipo:
             self.next()
@@ -3,6 +3,10 @@ from typing import Any
 
 @dataclass
 class Token:
+    # __slots__ declarado à mão (dataclass(slots=True) só existe a partir do 3.10):
+    # sem __dict__ por token e acesso direto aos campos
+    __slots__ = ("tipo", "lexema", "valor", "linha", "coluna")
+
     tipo: str
     lexema: str
     valor: Any # esse valor foi adicionado pra ficar igual o exemplo do professor
@@ -0,0 +1,48 @@
+# setup.py — instalação do LexerProject, com build compilado opcional via mypyc ou Cython
+"""
+Instalação normal (Python puro):
+    pip install .
+
+Build compilado com mypyc (requer `pip install -r requirements-dev.txt`):
+    LEXER_MYPYC=1 pip install .
+    # ou, para usar direto da pasta do projeto:
+    LEXER_MYPYC=1 python setup.py build_ext --inplace
+
+Build compilado com Cython (modo "pure Python", sem arquivo .pyx):
+    LEXER_CYTHON=1 python setup.py build_ext --inplace
+
+O mypyc compila parser_kotlin.py, ast_nodes.py e lexer.py para extensões C
+usando as anotações de tipo dos módulos (os nós da AST viram classes nativas;
+no lexer, compila o código em volta de cada casamento da regex mestra _RE_TOKEN
+no laço de proximo_token, já que a regex em si roda em C no módulo re);
+o Cython compila o mesmo parser_kotlin.py (as anotações viram tipos C onde
+possível). Sem nenhuma das variáveis de ambiente, nada é compilado e o parser
+roda em Python puro.
+"""
+import os
+
+from setuptools import setup
+
+ext_modules = []
+if os.environ.get("LEXER_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify([
+        "LexerProject/parser_kotlin.py",
+        "LexerProject/ast_nodes.py",
+        "LexerProject/lexer.py",
+    ])
+elif os.environ.get("LEXER_CYTHON") == "1":
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        ["LexerProject/parser_kotlin.py"],
+        compiler_directives={"language_level": "3"},
+    )
+
+setup(
+    name="LexerProject",
+    version="0.1.0",
+    description="Analisador léxico e sintático para um subconjunto de Kotlin",
+    packages=["LexerProject"],
+    python_requires=">=3.8",
+    ext_modules=ext_modules,
+)